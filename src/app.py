@@ -5,108 +5,126 @@ A super simple FastAPI application that allows students to view and sign up
 for extracurricular activities at Mergington High School.
 """
 
+import copy
+
 from fastapi import FastAPI, HTTPException
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import RedirectResponse
 import os
 from pathlib import Path
 
-app = FastAPI(title="Mergington High School API",
-              description="API for viewing and signing up for extracurricular activities")
-
-# Mount the static files directory
 current_dir = Path(__file__).parent
-app.mount("/static", StaticFiles(directory=os.path.join(Path(__file__).parent,
-          "static")), name="static")
 
-# In-memory activity database
-activities = {
+# Initial in-memory activity database, copied into each app instance
+# Participants are dicts used as ordered sets: fast lookups, signup order kept
+INITIAL_ACTIVITIES = {
         # Dictionary mapping activity names to their details
         "Chess Club": {
             "description": "Learn strategies and compete in chess tournaments",
             "schedule": "Fridays, 3:30 PM - 5:00 PM",
             "max_participants": 12,
-            "participants": ["michael@mergington.edu", "daniel@mergington.edu"]
+            "participants": dict.fromkeys(["michael@mergington.edu", "daniel@mergington.edu"])
         },
         "Programming Class": {
             "description": "Learn programming fundamentals and build software projects",
             "schedule": "Tuesdays and Thursdays, 3:30 PM - 4:30 PM",
             "max_participants": 20,
-            "participants": ["emma@mergington.edu", "sophia@mergington.edu"]
+            "participants": dict.fromkeys(["emma@mergington.edu", "sophia@mergington.edu"])
         },
         "Gym Class": {
             "description": "Physical education and sports activities",
             "schedule": "Mondays, Wednesdays, Fridays, 2:00 PM - 3:00 PM",
             "max_participants": 30,
-            "participants": ["john@mergington.edu", "olivia@mergington.edu"]
+            "participants": dict.fromkeys(["john@mergington.edu", "olivia@mergington.edu"])
         },
         "Basketball Team": {
             "description": "Competitive basketball team for interscholastic games",
             "schedule": "Mondays and Thursdays, 4:00 PM - 5:30 PM",
             "max_participants": 15,
-            "participants": ["alex@mergington.edu"]
+            "participants": dict.fromkeys(["alex@mergington.edu"])
         },
         "Tennis Club": {
             "description": "Learn tennis skills and participate in friendly matches",
             "schedule": "Wednesdays and Saturdays, 3:00 PM - 4:30 PM",
             "max_participants": 10,
-            "participants": ["lucas@mergington.edu", "ava@mergington.edu"]
+            "participants": dict.fromkeys(["lucas@mergington.edu", "ava@mergington.edu"])
         },
         "Debate Club": {
             "description": "Develop critical thinking and public speaking skills",
             "schedule": "Tuesdays, 3:30 PM - 5:00 PM",
             "max_participants": 16,
-            "participants": ["sarah@mergington.edu"]
+            "participants": dict.fromkeys(["sarah@mergington.edu"])
         },
         "Science Club": {
             "description": "Conduct experiments and explore scientific concepts",
             "schedule": "Wednesdays, 3:30 PM - 4:30 PM",
             "max_participants": 18,
-            "participants": ["james@mergington.edu", "mia@mergington.edu"]
+            "participants": dict.fromkeys(["james@mergington.edu", "mia@mergington.edu"])
         },
         "Drama Club": {
             "description": "Perform in theatrical productions and develop acting skills",
             "schedule": "Mondays and Thursdays, 3:30 PM - 5:00 PM",
             "max_participants": 25,
-            "participants": ["grace@mergington.edu", "ethan@mergington.edu"]
+            "participants": dict.fromkeys(["grace@mergington.edu", "ethan@mergington.edu"])
         },
         "Art Studio": {
             "description": "Create paintings, drawings, and sculptures",
             "schedule": "Tuesdays and Fridays, 3:30 PM - 5:00 PM",
             "max_participants": 20,
-            "participants": ["isabella@mergington.edu"]
+            "participants": dict.fromkeys(["isabella@mergington.edu"])
         }
     }
 
 
-@app.get("/")
-def root():
-    return RedirectResponse(url="/static/index.html")
+def create_app():
+    """Create the FastAPI application with its own fresh activity database"""
+    app = FastAPI(title="Mergington High School API",
+                  description="API for viewing and signing up for extracurricular activities")
+
+    # Mount the static files directory
+    app.mount("/static", StaticFiles(directory=os.path.join(current_dir,
+              "static")), name="static")
+
+    # In-memory activity database for this app instance
+    activities = copy.deepcopy(INITIAL_ACTIVITIES)
+    app.state.activities = activities
+
+    @app.get("/")
+    def root():
+        return RedirectResponse(url="/static/index.html")
+
+    @app.get("/activities")
+    def get_activities():
+        # Return participants as a list in signup order
+        return {
+            name: {**details, "participants": list(details["participants"])}
+            for name, details in activities.items()
+        }
+
+    @app.post("/activities/{activity_name}/signup")
+    def signup_for_activity(activity_name: str, email: str):
+        """Sign up a student for an activity"""
+        # Validate activity exists
+        if activity_name not in activities:
+            raise HTTPException(status_code=404, detail="Activity not found")
+
+        # Get the specific activity
+        activity = activities[activity_name]
 
+        # Validate student is not already signed up
+        if email in activity["participants"]:
+            raise HTTPException(status_code=400, detail="Student already signed up")
 
-@app.get("/activities")
-def get_activities():
-    return activities
+        # Check if activity is full
+        if len(activity["participants"]) >= activity["max_participants"]:
+            raise HTTPException(status_code=400, detail="Activity is full")
 
+        # Add student
+        activity["participants"][email] = None
+        return {"message": f"Signed up {email} for {activity_name}"}
 
-@app.post("/activities/{activity_name}/signup")
-def signup_for_activity(activity_name: str, email: str):
-    """Sign up a student for an activity"""
-    # Validate activity exists
-    if activity_name not in activities:
-        raise HTTPException(status_code=404, detail="Activity not found")
+    return app
 
-    # Get the specific activity
-    activity = activities[activity_name]
 
-# Validate student is not already signed up
-    if email in activity["participants"]:
-        raise HTTPException(status_code=400, detail="Student already signed up")    
-    
-    # Check if activity is full
-    if len(activity["participants"]) >= activity["max_participants"]:
-        raise HTTPException(status_code=400, detail="Activity is full") 
-    
-    # Add student
-    activity["participants"].append(email)
-    return {"message": f"Signed up {email} for {activity_name}"}
+app = create_app()
+activities = app.state.activities
@@ -2,94 +2,68 @@
 Pytest configuration and fixtures for testing the FastAPI application
 """
 
+import orjson
 import pytest
-import sys
-from pathlib import Path
+from httpx import ASGITransport, AsyncClient
+from app import INITIAL_ACTIVITIES, create_app
 
-# Add the src directory to the path so we can import the app
-sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
-from fastapi.testclient import TestClient
-from app import app, activities
+@pytest.fixture(scope="session")
+def app():
+    """Fixture to provide a FastAPI app with its own state for each xdist worker"""
+    return create_app()
 
 
-@pytest.fixture
-def client():
-    """Fixture to provide a test client for the FastAPI app"""
-    return TestClient(app)
+@pytest.fixture(scope="session")
+def activities(app):
+    """Fixture to provide the in-memory activity database of the test app"""
+    return app.state.activities
+
+
+@pytest.fixture(scope="session")
+async def client(app):
+    """Fixture to provide an async test client for the FastAPI app, shared across the session"""
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as async_client:
+        yield async_client
+
+
+@pytest.fixture(scope="module")
+async def activities_response(client, activities):
+    """Fixture to provide one GET /activities response shared by read-only tests in a module"""
+    _restore_participants(activities)
+    return await client.get("/activities")
+
+
+@pytest.fixture(scope="session")
+def parse_json():
+    """Fixture to provide a helper that decodes a response body with orjson"""
+    def parse(response):
+        return orjson.loads(response.content)
 
+    return parse
 
-@pytest.fixture(autouse=True)
-def reset_activities():
+
+# Initial participants of each activity, built once at import time and restored before a test
+# Descriptions, schedules and capacities never change, so only participants are kept here
+_INITIAL_PARTICIPANTS = {
+    name: tuple(details["participants"]) for name, details in INITIAL_ACTIVITIES.items()
+}
+
+
+def _restore_participants(activities):
+    """Replace each activity's participants with its initial participants"""
+    for name, participants in _INITIAL_PARTICIPANTS.items():
+        activities[name]["participants"] = dict.fromkeys(participants)
+
+
+@pytest.fixture
+def reset_activities(activities):
     """
-    Fixture to reset the activities state before each test.
-    This ensures tests don't interfere with each other.
+    Fixture to reset the activities state before a test.
+    Request it in tests that sign students up so they don't interfere with each other.
     """
-    # Reset to initial state
-    initial_state = {
-        "Chess Club": {
-            "description": "Learn strategies and compete in chess tournaments",
-            "schedule": "Fridays, 3:30 PM - 5:00 PM",
-            "max_participants": 12,
-            "participants": ["michael@mergington.edu", "daniel@mergington.edu"]
-        },
-        "Programming Class": {
-            "description": "Learn programming fundamentals and build software projects",
-            "schedule": "Tuesdays and Thursdays, 3:30 PM - 4:30 PM",
-            "max_participants": 20,
-            "participants": ["emma@mergington.edu", "sophia@mergington.edu"]
-        },
-        "Gym Class": {
-            "description": "Physical education and sports activities",
-            "schedule": "Mondays, Wednesdays, Fridays, 2:00 PM - 3:00 PM",
-            "max_participants": 30,
-            "participants": ["john@mergington.edu", "olivia@mergington.edu"]
-        },
-        "Basketball Team": {
-            "description": "Competitive basketball team for interscholastic games",
-            "schedule": "Mondays and Thursdays, 4:00 PM - 5:30 PM",
-            "max_participants": 15,
-            "participants": ["alex@mergington.edu"]
-        },
-        "Tennis Club": {
-            "description": "Learn tennis skills and participate in friendly matches",
-            "schedule": "Wednesdays and Saturdays, 3:00 PM - 4:30 PM",
-            "max_participants": 10,
-            "participants": ["lucas@mergington.edu", "ava@mergington.edu"]
-        },
-        "Debate Club": {
-            "description": "Develop critical thinking and public speaking skills",
-            "schedule": "Tuesdays, 3:30 PM - 5:00 PM",
-            "max_participants": 16,
-            "participants": ["sarah@mergington.edu"]
-        },
-        "Science Club": {
-            "description": "Conduct experiments and explore scientific concepts",
-            "schedule": "Wednesdays, 3:30 PM - 4:30 PM",
-            "max_participants": 18,
-            "participants": ["james@mergington.edu", "mia@mergington.edu"]
-        },
-        "Drama Club": {
-            "description": "Perform in theatrical productions and develop acting skills",
-            "schedule": "Mondays and Thursdays, 3:30 PM - 5:00 PM",
-            "max_participants": 25,
-            "participants": ["grace@mergington.edu", "ethan@mergington.edu"]
-        },
-        "Art Studio": {
-            "description": "Create paintings, drawings, and sculptures",
-            "schedule": "Tuesdays and Fridays, 3:30 PM - 5:00 PM",
-            "max_participants": 20,
-            "participants": ["isabella@mergington.edu"]
-        }
-    }
-    
-    # Clear current state
-    activities.clear()
-    # Restore initial state
-    activities.update(initial_state)
-    
+    # Only participants change between tests, so replace each activity's participants container
+    _restore_participants(activities)
+
     yield
-    
-    # Cleanup (reset after test)
-    activities.clear()
-    activities.update(initial_state)
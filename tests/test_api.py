@@ -2,15 +2,31 @@
 Test cases for the Mergington High School Activities API
 """
 
+from urllib.parse import quote
+
 import pytest
+from fastapi.testclient import TestClient
+from httpx import ASGITransport, AsyncClient
+
+from app import INITIAL_ACTIVITIES, create_app
+
+# URL-encoded activity names, computed once for building signup paths
+_ENCODED_ACTIVITIES = {
+    name: quote(name)
+    for name in (
+        "Chess Club", "Programming Class", "Gym Class",
+        "Basketball Team", "Tennis Club", "Debate Club",
+        "Science Club", "Drama Club", "Art Studio"
+    )
+}
 
 
 class TestRootEndpoint:
     """Tests for the root endpoint"""
     
-    def test_root_redirect(self, client):
+    async def test_root_redirect(self, client):
         """Test that root redirects to /static/index.html"""
-        response = client.get("/", follow_redirects=False)
+        response = await client.get("/", follow_redirects=False)
         assert response.status_code == 307
         assert response.headers["location"] == "/static/index.html"
 
@@ -18,12 +34,10 @@ class TestRootEndpoint:
 class TestGetActivitiesEndpoint:
     """Tests for the GET /activities endpoint"""
     
-    def test_get_all_activities(self, client):
+    def test_get_all_activities(self, activities_response, parse_json):
         """Test that we can retrieve all activities"""
-        response = client.get("/activities")
-        
-        assert response.status_code == 200
-        data = response.json()
+        assert activities_response.status_code == 200
+        data = parse_json(activities_response)
         
         # Check that all expected activities are present
         expected_activities = [
@@ -34,110 +48,104 @@ class TestGetActivitiesEndpoint:
         for activity in expected_activities:
             assert activity in data
     
-    def test_activity_structure(self, client):
+    def test_activity_structure(self, activities_response, parse_json):
         """Test that activities have the correct structure"""
-        response = client.get("/activities")
-        data = response.json()
+        data = parse_json(activities_response)
         
         # Check one activity has all required fields
         chess_club = data["Chess Club"]
-        assert "description" in chess_club
-        assert "schedule" in chess_club
-        assert "max_participants" in chess_club
-        assert "participants" in chess_club
+        assert chess_club["description"] == "Learn strategies and compete in chess tournaments"
+        assert chess_club["schedule"] == "Fridays, 3:30 PM - 5:00 PM"
+        assert chess_club["max_participants"] == 12
         assert isinstance(chess_club["participants"], list)
     
-    def test_activities_have_participants(self, client):
-        """Test that activities include their participants"""
-        response = client.get("/activities")
-        data = response.json()
+    def test_activities_have_participants(self, activities_response, parse_json):
+        """Test that activities include their participants in signup order"""
+        data = parse_json(activities_response)
         
-        # Chess Club should have michael and daniel
+        # Chess Club should have michael and daniel, in that order
         chess_participants = data["Chess Club"]["participants"]
-        assert "michael@mergington.edu" in chess_participants
-        assert "daniel@mergington.edu" in chess_participants
+        assert chess_participants == ["michael@mergington.edu", "daniel@mergington.edu"]
 
 
 class TestSignupEndpoint:
     """Tests for the POST /activities/{activity_name}/signup endpoint"""
     
-    def test_successful_signup(self, client):
+    async def test_successful_signup(self, client, parse_json, reset_activities):
         """Test that a student can successfully sign up for an activity"""
-        response = client.post(
+        response = await client.post(
             "/activities/Chess%20Club/signup",
             params={"email": "newstudent@mergington.edu"}
         )
         
         assert response.status_code == 200
-        data = response.json()
+        data = parse_json(response)
         assert "message" in data
         assert "newstudent@mergington.edu" in data["message"]
     
-    def test_signup_adds_participant(self, client):
+    async def test_signup_adds_participant(self, client, parse_json, reset_activities):
         """Test that signup actually adds the participant to the activity"""
         # Sign up a new student
-        client.post(
+        await client.post(
             "/activities/Chess%20Club/signup",
             params={"email": "newstudent@mergington.edu"}
         )
         
         # Verify they were added
-        response = client.get("/activities")
-        participants = response.json()["Chess Club"]["participants"]
-        assert "newstudent@mergington.edu" in participants
+        response = await client.get("/activities")
+        participants = parse_json(response)["Chess Club"]["participants"]
+        assert participants[-1] == "newstudent@mergington.edu"
     
-    def test_signup_nonexistent_activity(self, client):
+    async def test_signup_nonexistent_activity(self, client, parse_json):
         """Test that signup fails for a non-existent activity"""
-        response = client.post(
+        response = await client.post(
             "/activities/Fake%20Activity/signup",
             params={"email": "student@mergington.edu"}
         )
         
         assert response.status_code == 404
-        assert "Activity not found" in response.json()["detail"]
+        assert "Activity not found" in parse_json(response)["detail"]
     
-    def test_signup_duplicate_student(self, client):
+    async def test_signup_duplicate_student(self, client, parse_json, reset_activities):
         """Test that a student cannot sign up twice for the same activity"""
-        response = client.post(
+        response = await client.post(
             "/activities/Chess%20Club/signup",
             params={"email": "michael@mergington.edu"}
         )
         
         assert response.status_code == 400
-        assert "already signed up" in response.json()["detail"]
+        assert "already signed up" in parse_json(response)["detail"]
     
-    def test_signup_activity_full(self, client):
+    async def test_signup_activity_full(self, client, parse_json, activities, reset_activities):
         """Test that signup fails when activity is at max capacity"""
         # Tennis Club has max 10 participants and currently has 2
-        # Add 8 more to fill it up
-        for i in range(8):
-            client.post(
-                "/activities/Tennis%20Club/signup",
-                params={"email": f"student{i}@mergington.edu"}
-            )
+        # Add 8 more directly to fill it up
+        activities["Tennis Club"]["participants"].update(
+            dict.fromkeys(f"student{i}@mergington.edu" for i in range(8))
+        )
         
         # Try to sign up one more (should fail)
-        response = client.post(
+        response = await client.post(
             "/activities/Tennis%20Club/signup",
             params={"email": "overflow@mergington.edu"}
         )
         
         assert response.status_code == 400
-        assert "full" in response.json()["detail"]
+        assert "full" in parse_json(response)["detail"]
     
-    def test_signup_with_special_characters_in_name(self, client):
+    async def test_signup_with_special_characters_in_name(self, client, reset_activities):
         """Test signup for activity with spaces and special characters"""
-        response = client.post(
+        response = await client.post(
             "/activities/Programming%20Class/signup",
             params={"email": "student@mergington.edu"}
         )
         
         assert response.status_code == 200
     
-    def test_signup_email_validation(self, client):
+    async def test_signup_email_validation(self, client, reset_activities):
         """Test that various email formats are accepted"""
         # Note: FastAPI doesn't validate email format in query params by default
-        response = client.post(
+        response = await client.post(
             "/activities/Chess%20Club/signup",
             params={"email": "test.email+tag@mergington.edu"}
         )
@@ -149,41 +157,85 @@ class TestSignupEndpoint:
 class TestIntegration:
     """Integration tests combining multiple endpoints"""
     
-    def test_signup_and_verify_participants_updated(self, client):
+    async def test_signup_and_verify_participants_updated(self, client, parse_json, activities, reset_activities):
         """Test the complete flow of signing up and verifying the change"""
         new_email = "integration@mergington.edu"
         
         # Get initial participant count
-        response1 = client.get("/activities")
-        initial_count = len(response1.json()["Drama Club"]["participants"])
+        response1 = await client.get("/activities")
+        initial_count = len(parse_json(response1)["Drama Club"]["participants"])
         
         # Sign up
-        signup_response = client.post(
+        signup_response = await client.post(
             "/activities/Drama%20Club/signup",
             params={"email": new_email}
         )
         assert signup_response.status_code == 200
         
-        # Verify the count increased
-        response2 = client.get("/activities")
-        final_count = len(response2.json()["Drama Club"]["participants"])
+        # Verify the count increased in the app's in-process state
+        final_count = len(activities["Drama Club"]["participants"])
         assert final_count == initial_count + 1
     
-    def test_multiple_signups(self, client):
+    async def test_multiple_signups(self, client, parse_json, reset_activities):
         """Test that multiple students can sign up for different activities"""
         emails = ["student1@mergington.edu", "student2@mergington.edu", "student3@mergington.edu"]
-        activities = ["Chess Club", "Programming Class", "Science Club"]
+        activity_names = ["Chess Club", "Programming Class", "Science Club"]
         
-        for email, activity in zip(emails, activities):
-            response = client.post(
-                f"/activities/{activity.replace(' ', '%20')}/signup",
+        for email, activity in zip(emails, activity_names):
+            response = await client.post(
+                f"/activities/{_ENCODED_ACTIVITIES[activity]}/signup",
                 params={"email": email}
             )
             assert response.status_code == 200
         
         # Verify all signups were successful
-        response = client.get("/activities")
-        data = response.json()
-        assert "student1@mergington.edu" in data["Chess Club"]["participants"]
-        assert "student2@mergington.edu" in data["Programming Class"]["participants"]
-        assert "student3@mergington.edu" in data["Science Club"]["participants"]
+        response = await client.get("/activities")
+        data = parse_json(response)
+        for email, activity in zip(emails, activity_names):
+            assert email in data[activity]["participants"]
+
+
+class TestCreateApp:
+    """Tests for the create_app factory"""
+    
+    async def test_apps_have_independent_state(self):
+        """Test that a signup on one app leaves other apps and the initial data unchanged"""
+        first_app, second_app = create_app(), create_app()
+        new_email = "isolated@mergington.edu"
+        
+        transport = ASGITransport(app=first_app)
+        async with AsyncClient(transport=transport, base_url="http://test") as first_client:
+            response = await first_client.post(
+                "/activities/Chess%20Club/signup",
+                params={"email": new_email}
+            )
+        assert response.status_code == 200
+        
+        assert new_email in first_app.state.activities["Chess Club"]["participants"]
+        assert new_email not in second_app.state.activities["Chess Club"]["participants"]
+        assert new_email not in INITIAL_ACTIVITIES["Chess Club"]["participants"]
+
+
+class TestSignupBenchmark:
+    """Benchmarks for the signup endpoint (deselected by default, run with `pytest -m benchmark`)"""
+    
+    # Upper bound on the mean duplicate-signup time, well above the ~1-2 ms measured locally
+    MAX_MEAN_SECONDS = 0.05
+    
+    @pytest.mark.benchmark
+    def test_benchmark_duplicate_signup(self, app, benchmark, reset_activities):
+        """Benchmark the duplicate check that every signup goes through"""
+        # pytest-benchmark calls a sync function, so use a sync client here
+        with TestClient(app) as sync_client:
+            response = benchmark(
+                sync_client.post,
+                "/activities/Chess%20Club/signup",
+                params={"email": "michael@mergington.edu"}
+            )
+        
+        assert response.status_code == 400
+        
+        # No stats are collected under --benchmark-disable or xdist
+        if benchmark.disabled:
+            pytest.skip("benchmark timing disabled")
+        assert benchmark.stats.stats.mean < self.MAX_MEAN_SECONDS